@@ -1,78 +1,199 @@
-from flask import Flask, render_template, abort
+from flask import Flask, render_template, abort, jsonify
+from jinja2 import FileSystemBytecodeCache
 import os
-import markdown
+import mistune
 from datetime import datetime
 import json
-import glob
+try:
+    # orjson is optional; it decodes JSON faster than the stdlib when installed
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+import re
+import yaml
 import requests
+from requests.adapters import HTTPAdapter
 from functools import lru_cache
+from operator import itemgetter
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # Cache for chess games (5 minute TTL)
 _games_cache = {'data': None, 'timestamp': 0}
 CACHE_TTL = 300  # 5 minutes
+# Held while a background refresh of the games cache is running
+_games_refresh_lock = threading.Lock()
+
+# Cache for parsed blog posts, invalidated when any post file changes
+_posts_cache = {'data': None, 'slug_index': None, 'signature': None}
+
+# Cache for projects, invalidated when the projects file changes
+_projects_cache = {'data': None, 'featured': None, 'mtime': None}
+
+# Rendered HTML per template, reused while the template context is unchanged
+_pages_cache = {}
+
+# Shared HTTP session so repeat calls to the same host reuse TCP/TLS connections
+http_session = requests.Session()
+http_session.headers.update({'User-Agent': 'MattMcCarthy.dev/1.0'})
+http_session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8))
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'your-secret-key-change-in-production'
+# Keep compiled templates in a per-user temp directory so restarts skip recompiling
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache()
 
 # Configuration
 BLOG_DIR = 'content/blog'
 PROJECTS_FILE = 'content/projects.json'
 
-def load_blog_posts():
-    """Load all blog posts from markdown files"""
-    posts = []
+# Front matter block delimited by '---' lines at the top of a post
+FRONT_MATTER_RE = re.compile(r'\A---[ \t]*\r?\n(.*?)\r?\n---[ \t]*(?:\r?\n|\Z)(.*)', re.DOTALL)
+# Use the libyaml-backed loader when PyYAML was built with it
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Time control in seconds with an optional increment, e.g. "900+10" or "600"
+TIME_CONTROL_RE = re.compile(r'\s*(\d+)\s*(?:\+\s*(\d+)\s*)?\Z')
+# Pre-formatted results for the time controls that come up most often
+COMMON_TIME_CONTROLS = {
+    '60': '1',
+    '180': '3',
+    '300': '5',
+    '600': '10',
+    '900': '15',
+    '1800': '30',
+    '60+0': '1+0',
+    '60+1': '1+1',
+    '120+1': '2+1',
+    '180+0': '3+0',
+    '180+2': '3+2',
+    '300+0': '5+0',
+    '300+3': '5+3',
+    '300+5': '5+5',
+    '600+0': '10+0',
+    '600+5': '10+5',
+    '900+10': '15+10',
+    '1800+0': '30+0',
+    '1800+20': '30+20'
+}
+
+# PGN tag pair such as [White "mtmccarthy14"] at the start of a line
+PGN_TAG_RE = re.compile(r'^[ \t]*\[(\w+)[ \t]+"(.*)"\]', re.MULTILINE)
+# PGN tags copied verbatim into the game dict, keyed by tag name
+PGN_TAG_FIELDS = {
+    'White': 'white',
+    'Black': 'black',
+    'Result': 'result',
+    'Date': 'date',
+    'ECO': 'eco',
+    'Opening': 'opening'
+}
+
+# Markdown renderer shared by all posts (hard_wrap matches the old nl2br behaviour).
+# Fenced code is emitted as <pre><code class="language-xxx"> and highlighted
+# in the browser by Prism, so rendering does no syntax highlighting itself.
+render_markdown = mistune.create_markdown(
+    escape=False,
+    hard_wrap=True,
+    plugins=['table', 'strikethrough', 'footnotes']
+)
+
+def blog_signature():
+    """Return a (path, mtime) tuple for every post, used to detect changes"""
     if not os.path.exists(BLOG_DIR):
-        return posts
+        return ()
+    with os.scandir(BLOG_DIR) as entries:
+        return tuple(sorted(
+            (entry.path, entry.stat().st_mtime_ns)
+            for entry in entries
+            if entry.name.endswith('.md') and not entry.name.startswith('.') and entry.is_file()
+        ))
+
+def parse_post_date(date_str):
+    """Parse a YYYY-MM-DD post date without going through strptime"""
+    year, month, day = date_str.split('-')
+    return datetime(int(year), int(month), int(day))
+
+@lru_cache(maxsize=256)
+def render_blog_post(file_path, mtime_ns):
+    """Parse and render a single post; the mtime in the key skips stale entries"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        # Posts must open with front matter, so skip other files after a short probe
+        if f.read(3) != '---':
+            return None
+        content = '---' + f.read()
+        
+    # Parse front matter
+    match = FRONT_MATTER_RE.match(content)
+    if not match:
+        return None
+    front_matter, body = match.group(1), match.group(2).strip()
     
-    for file_path in glob.glob(os.path.join(BLOG_DIR, '*.md')):
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            
-        # Parse front matter
-        if content.startswith('---'):
-            parts = content.split('---', 2)
-            if len(parts) >= 3:
-                front_matter = parts[1].strip()
-                body = parts[2].strip()
-                
-                # Simple front matter parsing
-                metadata = {}
-                for line in front_matter.split('\n'):
-                    if ':' in line:
-                        key, value = line.split(':', 1)
-                        metadata[key.strip()] = value.strip().strip('"\'')
-                
-                metadata['slug'] = os.path.splitext(os.path.basename(file_path))[0]
-                # Configure markdown with extensions
-                md = markdown.Markdown(extensions=[
-                    'fenced_code',
-                    'tables',
-                    'codehilite',
-                    'nl2br',
-                    'sane_lists'
-                ], extension_configs={
-                    'codehilite': {
-                        'css_class': 'codehilite',
-                        'use_pygments': True,
-                        'noclasses': False
-                    }
-                })
-                metadata['body'] = md.convert(body)
-                metadata['date'] = datetime.strptime(metadata.get('date', '2024-01-01'), '%Y-%m-%d')
-                posts.append(metadata)
+    try:
+        parsed = yaml.load(front_matter, Loader=YAML_LOADER) or {}
+    except yaml.YAMLError as e:
+        print(f"Error parsing front matter in {file_path}: {e}")
+        return None
+    if not isinstance(parsed, dict):
+        return None
+    # Templates expect strings, so undo YAML's int/date coercion of unquoted values
+    metadata = {str(key): '' if value is None else str(value) for key, value in parsed.items()}
+    
+    metadata['slug'] = os.path.splitext(os.path.basename(file_path))[0]
+    metadata['body'] = render_markdown(body)
+    metadata['date'] = parse_post_date(metadata.get('date', '2024-01-01'))
+    return metadata
+
+def load_blog_index():
+    """Load all blog posts plus a slug -> position index, cached until a file changes"""
+    signature = blog_signature()
+    if _posts_cache['data'] is not None and _posts_cache['signature'] == signature:
+        return _posts_cache['data'], _posts_cache['slug_index']
+    
+    posts = []
+    for file_path, mtime_ns in signature:
+        post = render_blog_post(file_path, mtime_ns)
+        if post is not None:
+            posts.append(post)
     
     # Sort by date, newest first
-    posts.sort(key=lambda x: x['date'], reverse=True)
-    return posts
+    posts.sort(key=itemgetter('date'), reverse=True)
+    slug_index = {p['slug']: i for i, p in enumerate(posts)}
+    
+    # Update cache
+    _posts_cache['data'] = posts
+    _posts_cache['slug_index'] = slug_index
+    _posts_cache['signature'] = signature
+    return posts, slug_index
 
-def load_projects():
-    """Load projects from JSON file"""
+def load_blog_posts():
+    """Load all blog posts, newest first"""
+    return load_blog_index()[0]
+
+def load_projects_cached():
+    """Load projects and the featured subset, cached until the file changes"""
     if not os.path.exists(PROJECTS_FILE):
-        return []
+        return [], []
     
-    with open(PROJECTS_FILE, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    mtime_ns = os.stat(PROJECTS_FILE).st_mtime_ns
+    if _projects_cache['data'] is None or _projects_cache['mtime'] != mtime_ns:
+        with open(PROJECTS_FILE, 'rb') as f:
+            projects_list = json_loads(f.read())
+        
+        # Update cache
+        _projects_cache['data'] = projects_list
+        _projects_cache['featured'] = [p for p in projects_list if p.get('featured', False)]
+        _projects_cache['mtime'] = mtime_ns
+    return _projects_cache['data'], _projects_cache['featured']
+
+def load_projects():
+    """Load projects from JSON file"""
+    return load_projects_cached()[0]
+
+def load_featured_projects():
+    """Load only the projects marked as featured"""
+    return load_projects_cached()[1]
 
 def format_time_control(time_control_str):
     """Convert time control to minutes format (e.g., 900+10 -> 15+10)
@@ -81,35 +202,33 @@ def format_time_control(time_control_str):
     if not time_control_str or time_control_str == 'Unknown':
         return 'Unknown'
     
-    try:
-        # Handle formats like "900+10" or "5+0"
-        if '+' in time_control_str:
-            parts = time_control_str.split('+')
-            initial = int(parts[0])
-            increment = int(parts[1])
-            
-            # Convert initial time from seconds to minutes if >= 60
-            if initial >= 60:
-                initial = initial // 60
-            
-            # Keep increment in seconds (standard chess notation: minutes+seconds)
-            return f"{initial}+{increment}"
-        else:
-            # Handle single number format (just initial time)
-            initial = int(time_control_str)
-            if initial >= 60:
-                initial = initial // 60
-            return str(initial)
-    except (ValueError, IndexError):
+    # Most games use a handful of standard controls
+    common = COMMON_TIME_CONTROLS.get(time_control_str)
+    if common:
+        return common
+    
+    # Handle formats like "900+10" or "5+0", or just the initial time
+    match = TIME_CONTROL_RE.match(time_control_str)
+    if not match:
         return time_control_str
+    initial_str, increment_str = match.groups()
+    initial = int(initial_str)
+    
+    # Convert initial time from seconds to minutes if >= 60
+    if initial >= 60:
+        initial = initial // 60
+    
+    if increment_str is None:
+        return str(initial)
+    # Keep increment in seconds (standard chess notation: minutes+seconds)
+    return f"{initial}+{int(increment_str)}"
 
 def fetch_chess_com_games(username='mtmccarthy14', max_games=10):
     """Fetch recent games from Chess.com"""
     try:
         # Get available archives
         archives_url = f'https://api.chess.com/pub/player/{username}/games/archives'
-        headers = {'User-Agent': 'MattMcCarthy.dev/1.0'}
-        response = requests.get(archives_url, headers=headers, timeout=5)
+        response = http_session.get(archives_url, timeout=5)
         
         if response.status_code != 200:
             return []
@@ -120,16 +239,9 @@ def fetch_chess_com_games(username='mtmccarthy14', max_games=10):
         
         # Get games from the most recent archives (last 2 months)
         all_games = []
-        for archive_url in archives[-2:]:
-            try:
-                games_response = requests.get(f"{archive_url}/pgn", headers=headers, timeout=5)
-                if games_response.status_code == 200:
-                    # Parse PGN to extract game info
-                    pgn_text = games_response.text
-                    games = parse_pgn_games(pgn_text)
-                    all_games.extend(games)
-            except:
-                continue
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            for games in executor.map(fetch_chess_com_archive, archives[-2:]):
+                all_games.extend(games)
         
         # Sort by date and return most recent
         all_games.sort(key=lambda x: x.get('date', ''), reverse=True)
@@ -138,6 +250,56 @@ def fetch_chess_com_games(username='mtmccarthy14', max_games=10):
         print(f"Error fetching Chess.com games: {e}")
         return []
 
+def fetch_chess_com_archive(archive_url):
+    """Fetch one monthly Chess.com archive, falling back to the PGN export"""
+    try:
+        response = http_session.get(archive_url, timeout=5)
+        if response.status_code != 200:
+            return []
+        try:
+            return parse_chess_com_games(response.json().get('games', []))
+        except ValueError:
+            # Not JSON, so parse the PGN export instead
+            pgn_response = http_session.get(f"{archive_url}/pgn", timeout=5)
+            if pgn_response.status_code != 200:
+                return []
+            return parse_pgn_games(pgn_response.text)
+    except:
+        return []
+
+def parse_chess_com_games(games_data):
+    """Extract game information from Chess.com archive JSON"""
+    games = []
+    for game_data in games_data:
+        try:
+            white = game_data['white']
+            black = game_data['black']
+            game = {
+                'platform': 'Chess.com',
+                'white': white['username'],
+                'black': black['username'],
+                'result': get_chess_com_result(white, black),
+                'date': datetime.fromtimestamp(game_data['end_time']).strftime('%Y.%m.%d') if game_data.get('end_time') else '',
+                'time_control': format_time_control(game_data.get('time_control', 'Unknown')),
+                'url': game_data.get('url', '')
+            }
+            if game_data.get('eco'):
+                game['eco'] = game_data['eco']
+            games.append(game)
+        except:
+            continue
+    
+    return games
+
+def get_chess_com_result(white, black):
+    """Extract result from the per-player Chess.com results"""
+    if white.get('result') == 'win':
+        return '1-0'
+    elif black.get('result') == 'win':
+        return '0-1'
+    else:
+        return '1/2-1/2'
+
 def parse_pgn_games(pgn_text):
     """Parse PGN text to extract game information"""
     games = []
@@ -149,48 +311,21 @@ def parse_pgn_games(pgn_text):
             continue
             
         current_game = {}
-        lines = block.split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            if line.startswith('[') and ']' in line:
-                # Parse tag
-                try:
-                    tag = line[1:line.index(']')]
-                    if ' "' in tag:
-                        key, value = tag.split(' "', 1)
-                        key = key.strip()
-                        value = value.rstrip('"')
-                        
-                        if key == 'White':
-                            current_game['white'] = value
-                        elif key == 'Black':
-                            current_game['black'] = value
-                        elif key == 'Result':
-                            current_game['result'] = value
-                        elif key == 'Date':
-                            # Format: YYYY.MM.DD
-                            current_game['date'] = value.replace('.', '.')
-                        elif key == 'TimeControl':
-                            current_game['time_control'] = format_time_control(value)
-                        elif key == 'ECO':
-                            current_game['eco'] = value
-                        elif key == 'Opening':
-                            current_game['opening'] = value
-                        elif key == 'Site' and 'chess.com' in value.lower():
-                            # Extract game ID for URL
-                            if '/live/' in value:
-                                game_id = value.split('/live/')[-1].split('?')[0]
-                                current_game['url'] = f"https://www.chess.com/game/live/{game_id}"
-                except:
-                    continue
+        # Scan every tag line of the block in a single regex pass
+        for key, value in PGN_TAG_RE.findall(block):
+            field = PGN_TAG_FIELDS.get(key)
+            if field:
+                current_game[field] = value
+            elif key == 'TimeControl':
+                current_game['time_control'] = format_time_control(value)
+            elif key == 'Site' and '/live/' in value and 'chess.com' in value.lower():
+                # Extract game ID for URL
+                game_id = value.split('/live/')[-1].split('?')[0]
+                current_game['url'] = f"https://www.chess.com/game/live/{game_id}"
         
         # Store game if we have the required info
         if 'white' in current_game and 'black' in current_game:
             current_game['platform'] = 'Chess.com'
-            if 'url' not in current_game:
-                # Try to construct URL from game data if available
-                pass
             games.append(current_game)
     
     return games
@@ -200,26 +335,24 @@ def fetch_lichess_games(username='midnightconquer', max_games=10):
     try:
         # Lichess public API endpoint
         url = f'https://lichess.org/api/games/user/{username}'
-        headers = {
-            'Accept': 'application/x-ndjson',
-            'User-Agent': 'MattMcCarthy.dev/1.0'
-        }
+        headers = {'Accept': 'application/x-ndjson'}
         params = {
             'max': max_games,
             'rated': 'true',
             'perfType': 'blitz,rapid,classical'
         }
         
-        response = requests.get(url, headers=headers, params=params, timeout=5)
-        
-        if response.status_code != 200:
-            return []
-        
+        # Stream the NDJSON body and decode one game per line as it arrives
         games = []
-        for line in response.text.strip().split('\n'):
-            if line:
+        with http_session.get(url, headers=headers, params=params, timeout=5, stream=True) as response:
+            if response.status_code != 200:
+                return []
+            
+            for line in response.iter_lines():
+                if not line:
+                    continue
                 try:
-                    game_data = json.loads(line)
+                    game_data = json_loads(line)
                     game = {
                         'platform': 'Lichess',
                         'white': game_data.get('players', {}).get('white', {}).get('user', {}).get('name', 'Unknown'),
@@ -249,32 +382,91 @@ def get_lichess_result(game_data):
     else:
         return '1/2-1/2'
 
+def refresh_games_cache():
+    """Fetch recent games from both platforms and store them in the cache"""
+    # Fetch recent games from both platforms concurrently
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        chess_com_future = executor.submit(fetch_chess_com_games, 'mtmccarthy14', max_games=5)
+        lichess_future = executor.submit(fetch_lichess_games, 'midnightconquer', max_games=5)
+        chess_com_games = chess_com_future.result()
+        lichess_games = lichess_future.result()
+    
+    # Combine and sort by date
+    all_games = chess_com_games + lichess_games
+    all_games.sort(key=lambda x: x.get('date', ''), reverse=True)
+    recent_games = all_games[:10]
+    
+    # Update cache
+    _games_cache['data'] = recent_games
+    _games_cache['timestamp'] = time.time()
+    return recent_games
+
+def get_recent_games():
+    """Return cached games immediately, refreshing stale data in the background"""
+    if _games_cache['data'] is None:
+        return refresh_games_cache()
+    
+    recent_games = _games_cache['data']
+    if not recent_games or (time.time() - _games_cache['timestamp']) >= CACHE_TTL:
+        refresh_games_cache_in_background()
+    return recent_games
+
+def refresh_games_cache_in_background():
+    """Start a background cache refresh unless one is already running"""
+    if not _games_refresh_lock.acquire(blocking=False):
+        return
+    
+    def run():
+        try:
+            refresh_games_cache()
+        finally:
+            _games_refresh_lock.release()
+    
+    threading.Thread(target=run, daemon=True).start()
+
+def render_cached(template_name, **context):
+    """Render a template, reusing the previous HTML while the context is unchanged
+    
+    Context values are compared by identity first, so passing the cached
+    post, project and game lists ties invalidation to those caches.
+    """
+    if app.jinja_env.auto_reload:
+        # Templates may change on disk (debug mode), so always render
+        return render_template(template_name, **context)
+    
+    cached = _pages_cache.get(template_name)
+    if cached is not None and cached[0] == context:
+        return cached[1]
+    
+    html = render_template(template_name, **context)
+    _pages_cache[template_name] = (context, html)
+    return html
+
 @app.route('/')
 def index():
     posts = load_blog_posts()[:3]  # Latest 3 posts
-    all_projects = load_projects()
-    projects = [p for p in all_projects if p.get('featured', False)]  # All featured projects
-    return render_template('index.html', posts=posts, projects=projects)
+    projects = load_featured_projects()  # All featured projects
+    return render_cached('index.html', posts=posts, projects=projects)
 
 @app.route('/about')
 def about():
-    return render_template('about.html')
+    return render_cached('about.html')
 
 @app.route('/blog')
 def blog():
     posts = load_blog_posts()
-    return render_template('blog.html', posts=posts)
+    return render_cached('blog.html', posts=posts)
 
 @app.route('/blog/<slug>')
 def blog_post(slug):
-    posts = load_blog_posts()
-    post = next((p for p in posts if p['slug'] == slug), None)
+    posts, slug_index = load_blog_index()
+    current_index = slug_index.get(slug)
     
-    if not post:
+    if current_index is None:
         abort(404)
+    post = posts[current_index]
     
     # Get previous and next posts
-    current_index = next((i for i, p in enumerate(posts) if p['slug'] == slug), -1)
     prev_post = posts[current_index + 1] if current_index < len(posts) - 1 else None
     next_post = posts[current_index - 1] if current_index > 0 else None
     
@@ -287,37 +479,32 @@ def projects():
 
 @app.route('/resume')
 def resume():
-    return render_template('resume.html')
+    return render_cached('resume.html')
 
 @app.route('/chess')
 def chess():
-    # Check cache
-    current_time = time.time()
-    if _games_cache['data'] and (current_time - _games_cache['timestamp']) < CACHE_TTL:
-        recent_games = _games_cache['data']
+    # Recent games are loaded client-side from /api/chess/games
+    return render_cached('chess.html')
+
+@app.route('/api/chess/games')
+def chess_games_api():
+    recent_games = get_recent_games()
+    response = jsonify(games=recent_games)
+    if recent_games:
+        # Let browsers and any CDN in front of the app absorb repeat requests
+        response.headers['Cache-Control'] = f'public, max-age={CACHE_TTL}, stale-while-revalidate={2 * CACHE_TTL}'
     else:
-        # Fetch recent games from both platforms
-        chess_com_games = fetch_chess_com_games('mtmccarthy14', max_games=5)
-        lichess_games = fetch_lichess_games('midnightconquer', max_games=5)
-        
-        # Combine and sort by date
-        all_games = chess_com_games + lichess_games
-        all_games.sort(key=lambda x: x.get('date', ''), reverse=True)
-        recent_games = all_games[:10]
-        
-        # Update cache
-        _games_cache['data'] = recent_games
-        _games_cache['timestamp'] = current_time
-    
-    return render_template('chess.html', recent_games=recent_games)
+        # Don't pin an empty list from a failed fetch in downstream caches
+        response.headers['Cache-Control'] = 'no-cache'
+    return response
 
 @app.route('/jiu-jitsu')
 def jiu_jitsu():
-    return render_template('jiu-jitsu.html')
+    return render_cached('jiu-jitsu.html')
 
 @app.route('/strength-training')
 def strength_training():
-    return render_template('strength-training.html')
+    return render_cached('strength-training.html')
 
 if __name__ == '__main__':
     # Create necessary directories
@@ -0,0 +1,79 @@
+// Recent Games list for the chess page, loaded from /api/chess/games
+const CHESS_ACCOUNTS = {
+    'Chess.com': 'mtmccarthy14',
+    'Lichess': 'midnightconquer'
+};
+
+function userWon(game) {
+    const account = CHESS_ACCOUNTS[game.platform];
+    if (!account) {
+        return false;
+    }
+    return (game.result === '1-0' && (game.white || '').toLowerCase() === account) ||
+        (game.result === '0-1' && (game.black || '').toLowerCase() === account);
+}
+
+function renderGame(template, game) {
+    const card = template.content.firstElementChild.cloneNode(true);
+    const field = name => card.querySelector(`[data-field="${name}"]`);
+
+    const platform = field('platform');
+    platform.textContent = game.platform;
+    platform.classList.add(...(game.platform === 'Chess.com'
+        ? ['bg-green-100', 'text-green-700']
+        : ['bg-blue-100', 'text-blue-700']));
+    field('date').textContent = game.date || '';
+
+    const link = field('url');
+    if (game.url) {
+        link.href = game.url;
+    } else {
+        link.remove();
+    }
+
+    field('white').textContent = game.white;
+    field('black').textContent = game.black;
+
+    const result = field('result');
+    result.textContent = game.result;
+    if (userWon(game)) {
+        result.classList.add('text-green-600');
+    } else if (game.result === '1/2-1/2') {
+        result.classList.add('text-gray-600');
+    } else {
+        result.classList.add('text-red-600');
+    }
+
+    // Opening and time control are optional, as in the server-side template
+    ['opening', 'time_control'].forEach(name => {
+        const el = field(name);
+        if (game[name] && game[name] !== 'Unknown') {
+            el.querySelector('span').textContent = game[name];
+        } else {
+            el.remove();
+        }
+    });
+
+    return card;
+}
+
+// Load recent games when the page loads
+document.addEventListener('DOMContentLoaded', function() {
+    const container = document.getElementById('recent-games');
+    const template = document.getElementById('recent-game-template');
+    if (!container || !template) {
+        return;
+    }
+
+    fetch(container.dataset.src)
+        .then(response => response.ok ? response.json() : { games: [] })
+        .then(data => {
+            const games = data.games || [];
+            if (games.length === 0) {
+                return;
+            }
+            games.forEach(game => container.appendChild(renderGame(template, game)));
+            document.getElementById('recent-games-section').classList.remove('hidden');
+        })
+        .catch(error => console.error('Error loading recent games:', error));
+});